@@ -1,9 +1,59 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 from PIL import Image
 import io
 import os
-import time
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+
+# Maximum number of frame downloads in flight at once
+MAX_CONCURRENT_FRAMES = 4
+
+def create_session():
+    """Create an HTTP session that keeps connections alive between frames"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16,
+                          max_retries=Retry(total=2, connect=2, read=0, backoff_factor=0.2))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+# Shared across requests so the Pollinations TLS connection is reused
+http_session = create_session()
+
+def generate_frame(prompt, i, num_frames):
+    """
+    Generate a single video frame image, returning None on a failed response
+    """
+    # Add frame variation to prompt for motion
+    frame_prompt = f"{prompt}, frame {i+1} of {num_frames}, cinematic sequence"
+    
+    # Use Pollinations AI for unlimited image generation
+    url = f"https://image.pollinations.ai/prompt/{quote(frame_prompt)}"
+    params = {
+        'width': 1024,
+        'height': 1024,
+        'seed': i * 42,  # Different seed for each frame
+        'model': 'flux',
+        'enhance': 'true'
+    }
+    
+    logging.info(f"Generating frame {i+1}/{num_frames}")
+    
+    response = http_session.get(url, params=params, timeout=30)
+    
+    if response.status_code == 200:
+        # Decode here, in the download worker, rather than lazily on first
+        # use so decoding overlaps the other downloads
+        image = Image.open(io.BytesIO(response.content))
+        image.load()
+        logging.info(f"Frame {i+1} generated successfully")
+        return image
+    
+    logging.error(f"Failed to generate frame {i+1}: {response.status_code}")
+    return None
 
 def generate_image(prompt, num_frames=10, size="1024x1024"):
     """
@@ -12,34 +62,11 @@ def generate_image(prompt, num_frames=10, size="1024x1024"):
     images = []
     
     try:
-        for i in range(num_frames):
-            # Add frame variation to prompt for motion
-            frame_prompt = f"{prompt}, frame {i+1} of {num_frames}, cinematic sequence"
-            
-            # Use Pollinations AI for unlimited image generation
-            from urllib.parse import quote
-            url = f"https://image.pollinations.ai/prompt/{quote(frame_prompt)}"
-            params = {
-                'width': 1024,
-                'height': 1024,
-                'seed': i * 42,  # Different seed for each frame
-                'model': 'flux',
-                'enhance': 'true'
-            }
-            
-            logging.info(f"Generating frame {i+1}/{num_frames}")
-            
-            response = requests.get(url, params=params, timeout=30)
-            
-            if response.status_code == 200:
-                image = Image.open(io.BytesIO(response.content))
-                images.append(image)
-                logging.info(f"Frame {i+1} generated successfully")
-            else:
-                logging.error(f"Failed to generate frame {i+1}: {response.status_code}")
-                
-            # Small delay between requests
-            time.sleep(0.5)
+        # Frames are independent, so fetch them concurrently; the worker cap
+        # keeps the load on Pollinations polite
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FRAMES) as executor:
+            results = executor.map(lambda i: generate_frame(prompt, i, num_frames), range(num_frames))
+            images = [image for image in results if image is not None]
             
     except Exception as e:
         logging.error(f"Error generating images: {str(e)}")
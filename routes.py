@@ -6,7 +6,35 @@ import logging
 from datetime import datetime
 from image_generator import generate_image
 from video_generator import create_video_from_images
-from utils import validate_prompt, generate_filename
+from utils import validate_prompt, generate_filename, prompt_cache_key
+
+# Number of recent videos compared against when looking for equivalent prompts
+SIMILAR_PROMPT_SCAN_LIMIT = 100
+
+def video_file_exists(video_gen):
+    """Whether a generation's video file is still on disk"""
+    return os.path.exists(os.path.join('static', 'videos', video_gen.video_filename))
+
+def find_cached_video(prompt):
+    """
+    Find the most recent completed video for this prompt whose file is still
+    on disk, falling back to a recent video whose prompt differs only in
+    case, punctuation, spacing or the appended enhancements
+    """
+    completed = VideoGeneration.query.filter(
+        VideoGeneration.status == 'completed',
+        VideoGeneration.video_filename.isnot(None)
+    ).order_by(VideoGeneration.created_at.desc())
+    
+    for video_gen in completed.filter(VideoGeneration.prompt == prompt).limit(5).all():
+        if video_file_exists(video_gen):
+            return video_gen
+    
+    key = prompt_cache_key(prompt)
+    for video_gen in completed.limit(SIMILAR_PROMPT_SCAN_LIMIT).all():
+        if prompt_cache_key(video_gen.prompt) == key and video_file_exists(video_gen):
+            return video_gen
+    return None
 
 @app.route('/')
 def index():
@@ -25,6 +53,22 @@ def generate_video():
         # Validate and enhance prompt
         enhanced_prompt = validate_prompt(prompt)
         
+        # Reuse an existing video for the same prompt instead of regenerating
+        cached_video = find_cached_video(enhanced_prompt)
+        if cached_video:
+            logging.info(f"Reusing cached video for prompt: {enhanced_prompt}")
+            video_gen = VideoGeneration(
+                prompt=enhanced_prompt,
+                video_filename=cached_video.video_filename,
+                status='completed',
+                completed_at=datetime.utcnow()
+            )
+            db.session.add(video_gen)
+            db.session.commit()
+            
+            flash('Video generated successfully!', 'success')
+            return redirect(url_for('index'))
+        
         # Create database record
         video_gen = VideoGeneration(
             prompt=enhanced_prompt,
@@ -3,6 +3,14 @@ import uuid
 import os
 from datetime import datetime
 
+# Phrases appended to prompts for better video generation
+PROMPT_ENHANCEMENTS = [
+    "cinematic",
+    "high quality",
+    "detailed",
+    "professional lighting"
+]
+
 def validate_prompt(prompt):
     """
     Validate and enhance user prompt for better AI generation
@@ -13,22 +21,27 @@ def validate_prompt(prompt):
     # Clean up prompt
     cleaned = re.sub(r'[^\w\s\-\.,!?]', '', prompt.strip())
     
-    # Enhance prompt for better video generation
-    enhancements = [
-        "cinematic",
-        "high quality",
-        "detailed",
-        "professional lighting"
-    ]
-    
-    # Add enhancements if not already present
+    # Add enhancements for better video generation if not already present
     enhanced = cleaned
-    for enhancement in enhancements:
+    for enhancement in PROMPT_ENHANCEMENTS:
         if enhancement not in enhanced.lower():
             enhanced += f", {enhancement}"
     
     return enhanced
 
+def prompt_cache_key(prompt):
+    """
+    Normalize a prompt for cache lookups: drop the enhancement suffix added by
+    validate_prompt, ignore case, punctuation and spacing, and keep the words
+    in order
+    """
+    base = prompt.strip()
+    for enhancement in reversed(PROMPT_ENHANCEMENTS):
+        suffix = f", {enhancement}"
+        if base.lower().endswith(suffix):
+            base = base[:-len(suffix)]
+    return tuple(re.findall(r'\w+', base.casefold()))
+
 def generate_filename(prefix, extension):
     """
     Generate unique filename with timestamp and UUID
@@ -5,6 +5,57 @@ import os
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
 import random
 import math
+import re
+import shutil
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# Prompt keywords selecting visual effects (substring matches)
+GOLDEN_HOUR_KEYWORDS = re.compile(r'sunset|golden')
+WATER_KEYWORDS = re.compile(r'water|rain|ocean|sea')
+FIRE_KEYWORDS = re.compile(r'fire|flame|burning')
+SNOW_KEYWORDS = re.compile(r'snow|winter|ice')
+
+# Hook messages by prompt content, checked in order (substring matches)
+HOOK_MESSAGES = [
+    (re.compile(r'cat|dog|animal|pet'),
+     ("This is too cute! 😻", "Watch this amazing animal!", "You won't believe this!")),
+    (re.compile(r'beautiful|stunning|amazing'),
+     ("This is breathtaking!", "Watch this incredible view!", "Amazing transformation!")),
+    (re.compile(r'action|fast|speed|racing'),
+     ("Watch this incredible move!", "This is insane!", "Speed like never before!")),
+]
+DEFAULT_HOOKS = ("This is amazing!", "Watch this!", "Incredible AI creation!")
+
+# Golden hour tint in BGR order
+GOLDEN_TINT = np.array([0.1, 0.3, 0.5], dtype=np.float32)
+
+# 1-D taps of the 3x3 motion blur box filter
+MOTION_BLUR_KERNEL = np.full(3, 1 / 3, dtype=np.float32)
+
+# Text shadow opacity (0-255)
+TEXT_SHADOW_OPACITY = 128
+
+# Maximum number of frame render threads per video; each holds about 38 MB
+# of scratch buffers at 1024x1024
+MAX_RENDER_WORKERS = 8
+
+# Per-thread scratch buffers for frame rendering
+_scratch = threading.local()
+
+# Vignette gain maps keyed by (height, width)
+_VIGNETTE_CACHE = {}
+
+# H.264 encoders in order of preference, with their fastest presets
+H264_ENCODERS = [
+    ('h264_nvenc', ['-preset', 'p1']),
+    ('h264_qsv', ['-preset', 'veryfast']),
+    ('h264_videotoolbox', []),
+    ('libx264', ['-preset', 'ultrafast']),
+]
 
 def create_video_from_images(images, output_path, prompt):
     """
@@ -21,9 +72,8 @@ def create_video_from_images(images, output_path, prompt):
         duration = 10  # 10 seconds
         total_frames = fps * duration  # 150 frames
         
-        # Initialize video writer with high quality codec
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+        # Initialize video writer (H.264 through ffmpeg when available)
+        out = open_video_writer(output_path, fps, (width, height))
         
         if not out.isOpened():
             logging.error("Failed to open video writer")
@@ -34,40 +84,40 @@ def create_video_from_images(images, output_path, prompt):
         # Convert PIL images to OpenCV format
         cv_images = []
         for img in images:
-            img_resized = img.resize((width, height), Image.Resampling.LANCZOS)
-            cv_img = cv2.cvtColor(np.array(img_resized), cv2.COLOR_RGB2BGR)
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            cv_img = cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR)
+            
+            # Resize with OpenCV only when needed: area averaging when
+            # shrinking, bicubic when enlarging
+            if cv_img.shape[:2] != (height, width):
+                shrinking = cv_img.shape[0] > height or cv_img.shape[1] > width
+                interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_CUBIC
+                cv_img = cv2.resize(cv_img, (width, height), interpolation=interpolation)
             cv_images.append(cv_img)
         
-        # Generate video frames with smooth transitions and effects
-        for frame_idx in range(total_frames):
-            progress = frame_idx / total_frames
-            
-            # Determine which base images to blend
-            img_progress = progress * (len(cv_images) - 1)
-            base_idx = int(img_progress)
-            blend_factor = img_progress - base_idx
-            
-            if base_idx >= len(cv_images) - 1:
-                current_frame = cv_images[-1].copy()
-            else:
-                # Smooth blending between consecutive images
-                img1 = cv_images[base_idx]
-                img2 = cv_images[base_idx + 1]
-                current_frame = cv2.addWeighted(img1, 1 - blend_factor, img2, blend_factor, 0)
-            
-            # Apply advanced visual effects
-            current_frame = apply_visual_effects(current_frame, frame_idx, progress, prompt)
-            
-            # Add engaging hooks and text overlays
-            current_frame = add_hook_overlay(current_frame, frame_idx, total_frames, prompt)
-            
-            # Write frame to video
-            out.write(current_frame)
-            
-            if frame_idx % 30 == 0:  # Log progress every 2 seconds
-                logging.info(f"Generated frame {frame_idx}/{total_frames}")
+        # Pick the hook once so it stays readable instead of changing every frame
+        hook_text = random.choice(select_hooks(prompt))
+        
+        # Render frames on a thread pool (the NumPy/OpenCV work releases the
+        # GIL), keeping a bounded window in flight and writing them in order
+        workers = min(MAX_RENDER_WORKERS, available_cpu_count())
+        window = workers * 2
+        pending = deque()
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for frame_idx in range(total_frames):
+                    pending.append(executor.submit(render_video_frame, cv_images, frame_idx, total_frames,
+                                                   prompt, hook_text))
+                    if len(pending) >= window:
+                        out.write(pending.popleft().result())
+                
+                while pending:
+                    out.write(pending.popleft().result())
+        finally:
+            # Always close the writer so an ffmpeg child is never left running
+            out.release()
         
-        out.release()
         logging.info(f"Video created successfully: {output_path}")
         return True
         
@@ -75,208 +125,452 @@ def create_video_from_images(images, output_path, prompt):
         logging.error(f"Error creating video: {str(e)}")
         return False
 
+def available_cpu_count():
+    """Number of CPUs this process may run on, honouring CPU affinity"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def get_scratch_buffer(name, shape, dtype=np.float32):
+    """
+    Get a per-thread reusable array, reallocated only when the shape changes.
+    Contents are undefined and only valid until the same thread asks again.
+    """
+    buffers = getattr(_scratch, 'buffers', None)
+    if buffers is None:
+        buffers = _scratch.buffers = {}
+    
+    buffer = buffers.get(name)
+    if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+        buffer = buffers[name] = np.empty(shape, dtype)
+    return buffer
+
+def render_video_frame(cv_images, frame_idx, total_frames, prompt, hook_text=None):
+    """Render a single output frame with smooth transitions and effects"""
+    progress = frame_idx / total_frames
+    
+    # Determine which base images to blend
+    img_progress = progress * (len(cv_images) - 1)
+    base_idx = int(img_progress)
+    blend_factor = img_progress - base_idx
+    
+    # Effects run in this thread's reusable float buffer
+    current_frame = get_scratch_buffer('frame', cv_images[0].shape)
+    
+    if base_idx >= len(cv_images) - 1:
+        np.multiply(cv_images[-1], 1 / 255.0, out=current_frame)
+    else:
+        # Smooth blending between consecutive images, producing the
+        # normalized float frame the effects work on in the same pass
+        img1 = cv_images[base_idx]
+        img2 = cv_images[base_idx + 1]
+        cv2.addWeighted(img1, (1 - blend_factor) / 255.0,
+                        img2, blend_factor / 255.0, 0,
+                        dst=current_frame, dtype=cv2.CV_32F)
+    
+    # Apply advanced visual effects
+    current_frame = apply_visual_effects(current_frame, frame_idx, progress, prompt)
+    
+    # Add engaging hooks and text overlays
+    current_frame = add_hook_overlay(current_frame, frame_idx, total_frames, prompt, hook_text)
+    
+    if frame_idx % 30 == 0:  # Log progress every 2 seconds
+        logging.info(f"Generated frame {frame_idx}/{total_frames}")
+    
+    return current_frame
+
+class FFmpegVideoWriter:
+    """Pipe raw BGR frames into an ffmpeg H.264 encoder (cv2.VideoWriter-like API)"""
+
+    def __init__(self, output_path, fps, frame_size):
+        self.proc = None
+        encoder = detect_h264_encoder()
+        if encoder is None:
+            return
+        
+        width, height = frame_size
+        command = [
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+            '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+            *encoder, '-pix_fmt', 'yuv420p',
+            '-movflags', '+faststart',
+            output_path
+        ]
+        try:
+            self.proc = subprocess.Popen(command, stdin=subprocess.PIPE)
+        except OSError as e:
+            logging.error(f"Failed to start ffmpeg: {str(e)}")
+
+    def isOpened(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def write(self, frame):
+        # Hand the frame's buffer straight to the pipe instead of copying it
+        # into an intermediate bytes object
+        self.proc.stdin.write(np.ascontiguousarray(frame).data)
+
+    def release(self):
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+        except BrokenPipeError:
+            # ffmpeg already exited; its exit code below reports why
+            pass
+        if self.proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with code {self.proc.returncode}")
+
+@lru_cache(maxsize=1)
+def detect_h264_encoder():
+    """
+    Pick the fastest working H.264 encoder, preferring hardware encoders.
+    Listed encoders are test-encoded once since ffmpeg builds often ship
+    them without a usable device or library. Returns None when none work.
+    """
+    try:
+        listing = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                 capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    
+    for encoder, options in H264_ENCODERS:
+        if encoder not in listing:
+            continue
+        probe = ['ffmpeg', '-hide_banner', '-loglevel', 'error',
+                 '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.2',
+                 '-c:v', encoder, *options, '-pix_fmt', 'yuv420p', '-f', 'null', '-']
+        try:
+            if subprocess.run(probe, capture_output=True, timeout=10).returncode == 0:
+                logging.info(f"Using H.264 encoder: {encoder}")
+                return ['-c:v', encoder, *options]
+        except (OSError, subprocess.SubprocessError):
+            continue
+    
+    logging.warning("No working H.264 encoder found in ffmpeg")
+    return None
+
+def open_video_writer(output_path, fps, frame_size):
+    """
+    Open an H.264 ffmpeg pipe writer, falling back to OpenCV's mp4v writer
+    """
+    if shutil.which('ffmpeg'):
+        writer = FFmpegVideoWriter(output_path, fps, frame_size)
+        if writer.isOpened():
+            return writer
+        logging.warning("ffmpeg writer unavailable, falling back to OpenCV")
+    
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    return cv2.VideoWriter(output_path, fourcc, fps, frame_size)
+
+@lru_cache(maxsize=64)
+def select_visual_effects(prompt):
+    """
+    Resolve the prompt-dependent effects once per prompt instead of
+    rescanning keyword lists for every frame
+    """
+    prompt_lower = prompt.lower()
+    golden_hour = bool(GOLDEN_HOUR_KEYWORDS.search(prompt_lower))
+    
+    if WATER_KEYWORDS.search(prompt_lower):
+        add_particles = add_water_particles
+    elif FIRE_KEYWORDS.search(prompt_lower):
+        add_particles = add_fire_particles
+    elif SNOW_KEYWORDS.search(prompt_lower):
+        add_particles = add_snow_particles
+    else:
+        add_particles = add_sparkle_particles
+    
+    return golden_hour, add_particles
+
 def apply_visual_effects(frame, frame_idx, progress, prompt):
-    """Apply advanced visual effects for cinematic quality"""
+    """
+    Apply advanced visual effects for cinematic quality. Float32 frames are
+    used as the working buffer and modified in place; uint8 frames are copied.
+    """
     
-    # Convert to float for processing
-    frame_float = frame.astype(np.float32) / 255.0
+    # Convert to float for processing (blended frames already arrive as float)
+    if frame.dtype == np.uint8:
+        frame_float = frame.astype(np.float32) / 255.0
+    else:
+        frame_float = frame
+    
+    golden_hour, add_particles = select_visual_effects(prompt)
     
     # 1. Dynamic lighting effects
-    if "sunset" in prompt.lower() or "golden" in prompt.lower():
-        # Golden hour lighting
-        golden_overlay = np.zeros_like(frame_float)
-        golden_overlay[:, :, 0] = 0.1  # Blue
-        golden_overlay[:, :, 1] = 0.3  # Green  
-        golden_overlay[:, :, 2] = 0.5  # Red
-        frame_float = cv2.addWeighted(frame_float, 0.8, golden_overlay, 0.2, 0)
+    if golden_hour:
+        # Golden hour lighting, blended with a broadcast BGR tint instead of
+        # filling a full-size overlay frame every time
+        frame_float *= 0.8
+        frame_float += GOLDEN_TINT * 0.2
     
     # 2. Particle effects based on content
-    if any(word in prompt.lower() for word in ["water", "rain", "ocean", "sea"]):
-        frame_float = add_water_particles(frame_float, frame_idx)
-    elif any(word in prompt.lower() for word in ["fire", "flame", "burning"]):
-        frame_float = add_fire_particles(frame_float, frame_idx)
-    elif any(word in prompt.lower() for word in ["snow", "winter", "ice"]):
-        frame_float = add_snow_particles(frame_float, frame_idx)
-    else:
-        frame_float = add_sparkle_particles(frame_float, frame_idx)
+    frame_float = add_particles(frame_float, frame_idx)
     
     # 3. Cinematic post-processing
     frame_float = apply_cinematic_grade(frame_float, progress)
     
     # 4. Motion blur for realism
     if frame_idx > 0:
-        kernel_size = 3
-        kernel = np.ones((kernel_size, kernel_size), np.float32) / (kernel_size * kernel_size)
-        frame_float = cv2.filter2D(frame_float, -1, kernel)
+        # 3x3 box blur applied as two 1-D passes
+        frame_float = cv2.sepFilter2D(frame_float, -1, MOTION_BLUR_KERNEL, MOTION_BLUR_KERNEL,
+                                      dst=get_scratch_buffer('blur', frame_float.shape))
     
     # Convert back to uint8
-    frame_processed = (frame_float * 255).astype(np.uint8)
+    frame_float *= 255
+    frame_processed = frame_float.astype(np.uint8)
     
     return frame_processed
 
+def splat_particles(frame, xs, ys, radii, intensities, color):
+    """
+    Add square particles of the given per-channel color weights to the frame,
+    skipping particles that would cross the frame edge
+    """
+    height, width = frame.shape[:2]
+    inside = (ys - radii >= 0) & (ys + radii < height) & (xs - radii >= 0) & (xs + radii < width)
+    
+    xs, ys, radii, intensities = xs[inside], ys[inside], radii[inside], intensities[inside]
+    if not len(xs):
+        return frame
+    
+    # Pixel offsets of every particle's square [-r, r) in one grid,
+    # masked per particle radius
+    span = np.arange(-radii.max(), radii.max())
+    dy, dx = np.meshgrid(span, span, indexing='ij')
+    radii = radii[:, None, None]
+    covered = (dy >= -radii) & (dy < radii) & (dx >= -radii) & (dx < radii)
+    
+    rows = (ys[:, None, None] + dy)[covered]
+    cols = (xs[:, None, None] + dx)[covered]
+    amounts = np.broadcast_to(intensities[:, None, None], covered.shape)[covered]
+    
+    # Deposit all particles at once; overlapping particles still accumulate
+    color = np.asarray(color, dtype=np.float32)
+    np.add.at(frame, (rows, cols), amounts[:, None].astype(np.float32) * color)
+    
+    return frame
+
 def add_water_particles(frame, frame_idx):
     """Add realistic water droplet effects"""
     height, width = frame.shape[:2]
+    rng = np.random.default_rng()
     
     # Generate water droplets
-    for _ in range(random.randint(5, 15)):
-        x = random.randint(0, width-1)
-        y = random.randint(0, height-1) 
-        
-        # Animated droplet position
-        y_offset = (frame_idx * 2) % height
-        y = (y + y_offset) % height
-        
-        # Create droplet effect
-        radius = random.randint(1, 3)
-        intensity = random.uniform(0.1, 0.3)
-        
-        # Add blue tint for water
-        if y-radius >= 0 and y+radius < height and x-radius >= 0 and x+radius < width:
-            frame[y-radius:y+radius, x-radius:x+radius, 0] += intensity  # Blue channel
+    count = rng.integers(5, 16)
+    xs = rng.integers(0, width, count)
     
-    return frame
+    # Animated droplet position
+    y_offset = (frame_idx * 2) % height
+    ys = (rng.integers(0, height, count) + y_offset) % height
+    
+    # Create droplet effect
+    radii = rng.integers(1, 4, count)
+    intensities = rng.uniform(0.1, 0.3, count)
+    
+    # Add blue tint for water
+    return splat_particles(frame, xs, ys, radii, intensities, (1, 0, 0))
 
 def add_fire_particles(frame, frame_idx):
     """Add realistic fire particle effects"""
     height, width = frame.shape[:2]
+    rng = np.random.default_rng()
     
-    for _ in range(random.randint(8, 20)):
-        x = random.randint(0, width-1)
-        y = random.randint(height//2, height-1)  # Fire rises from bottom
-        
-        # Animated flame movement
-        y_offset = -(frame_idx * 3) % (height//2)
-        y = max(0, y + y_offset)
-        
-        radius = random.randint(1, 4)
-        intensity = random.uniform(0.2, 0.5)
-        
-        # Add red/orange tint
-        if y-radius >= 0 and y+radius < height and x-radius >= 0 and x+radius < width:
-            frame[y-radius:y+radius, x-radius:x+radius, 2] += intensity  # Red
-            frame[y-radius:y+radius, x-radius:x+radius, 1] += intensity * 0.5  # Green
+    count = rng.integers(8, 21)
+    xs = rng.integers(0, width, count)
+    ys = rng.integers(height//2, height, count)  # Fire rises from bottom
     
-    return frame
+    # Animated flame movement
+    y_offset = -(frame_idx * 3) % (height//2)
+    ys = np.maximum(0, ys + y_offset)
+    
+    radii = rng.integers(1, 5, count)
+    intensities = rng.uniform(0.2, 0.5, count)
+    
+    # Add red/orange tint
+    return splat_particles(frame, xs, ys, radii, intensities, (0, 0.5, 1))
 
 def add_snow_particles(frame, frame_idx):
     """Add realistic snow particle effects"""
     height, width = frame.shape[:2]
+    rng = np.random.default_rng()
     
-    for _ in range(random.randint(10, 25)):
-        x = random.randint(0, width-1)
-        y = random.randint(0, height-1)
-        
-        # Animated snowfall
-        y_offset = (frame_idx * 2) % height
-        y = (y + y_offset) % height
-        
-        radius = random.randint(1, 2)
-        intensity = random.uniform(0.3, 0.6)
-        
-        # Add white particles
-        if y-radius >= 0 and y+radius < height and x-radius >= 0 and x+radius < width:
-            frame[y-radius:y+radius, x-radius:x+radius] += intensity
+    count = rng.integers(10, 26)
+    xs = rng.integers(0, width, count)
     
-    return frame
+    # Animated snowfall
+    y_offset = (frame_idx * 2) % height
+    ys = (rng.integers(0, height, count) + y_offset) % height
+    
+    radii = rng.integers(1, 3, count)
+    intensities = rng.uniform(0.3, 0.6, count)
+    
+    # Add white particles
+    return splat_particles(frame, xs, ys, radii, intensities, (1, 1, 1))
 
 def add_sparkle_particles(frame, frame_idx):
     """Add magical sparkle effects"""
     height, width = frame.shape[:2]
+    rng = np.random.default_rng()
+    
+    count = rng.integers(3, 9)
+    xs = rng.integers(0, width, count)
+    ys = rng.integers(0, height, count)
     
-    for _ in range(random.randint(3, 8)):
-        x = random.randint(0, width-1)
-        y = random.randint(0, height-1)
+    # Twinkling effect
+    twinkle = np.abs(np.sin(frame_idx * 0.2 + xs * 0.01 + ys * 0.01))
+    radii = rng.integers(1, 4, count)
+    intensities = twinkle * rng.uniform(0.2, 0.4, count)
+    
+    # Add golden sparkles
+    return splat_particles(frame, xs, ys, radii, intensities, (0, 1, 1))
+
+def get_vignette_gain(height, width):
+    """
+    Per-pixel vignette gain with the contrast boost folded in, computed once
+    per frame size and shared read-only across frames and videos
+    """
+    key = (height, width)
+    if key not in _VIGNETTE_CACHE:
+        center_x, center_y = width // 2, height // 2
         
-        # Twinkling effect
-        twinkle = abs(math.sin(frame_idx * 0.2 + x * 0.01 + y * 0.01))
-        radius = random.randint(1, 3)
-        intensity = twinkle * random.uniform(0.2, 0.4)
+        y, x = np.ogrid[:height, :width]
+        mask = ((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5
+        mask = mask / mask.max()
         
-        # Add golden sparkles
-        if y-radius >= 0 and y+radius < height and x-radius >= 0 and x+radius < width:
-            frame[y-radius:y+radius, x-radius:x+radius, 1] += intensity  # Green
-            frame[y-radius:y+radius, x-radius:x+radius, 2] += intensity  # Red
-    
-    return frame
+        # Fold the contrast boost into the vignette so the frame is scaled once
+        gain = ((1 - (mask * 0.3)) * 1.1).astype(np.float32)
+        gain = np.expand_dims(gain, axis=2)
+        gain.flags.writeable = False
+        _VIGNETTE_CACHE[key] = gain
+    return _VIGNETTE_CACHE[key]
 
 def apply_cinematic_grade(frame, progress):
-    """Apply professional color grading"""
+    """Apply professional color grading (in place on float32 frames)"""
     
-    # Film grain effect
-    noise = np.random.normal(0, 0.01, frame.shape)
-    frame = frame + noise
+    # Film grain effect, generated in float32 so the frame is not promoted
+    noise = get_scratch_buffer('noise', frame.shape)
+    np.random.default_rng().standard_normal(dtype=np.float32, out=noise)
+    noise *= 0.01
+    frame += noise
     
     # Vignette effect
     height, width = frame.shape[:2]
-    center_x, center_y = width // 2, height // 2
-    
-    y, x = np.ogrid[:height, :width]
-    mask = ((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5
-    mask = mask / mask.max()
-    
-    vignette = 1 - (mask * 0.3)
-    vignette = np.expand_dims(vignette, axis=2)
-    frame = frame * vignette
+    gain = get_vignette_gain(height, width)
     
-    # Contrast and saturation boost
-    frame = np.clip(frame * 1.1 + 0.05, 0, 1)
+    # Vignette, contrast and saturation boost, fused into in-place passes
+    frame *= gain
+    frame += 0.05
+    np.clip(frame, 0, 1, out=frame)
     
     return frame
 
-def add_hook_overlay(frame, frame_idx, total_frames, prompt):
-    """Add engaging text overlays for viral content"""
-    
-    # Convert OpenCV frame to PIL for text rendering
-    frame_pil = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-    draw = ImageDraw.Draw(frame_pil)
-    
-    # Define hook messages based on content
-    hooks = []
-    if any(word in prompt.lower() for word in ["cat", "dog", "animal", "pet"]):
-        hooks = ["This is too cute! 😻", "Watch this amazing animal!", "You won't believe this!"]
-    elif any(word in prompt.lower() for word in ["beautiful", "stunning", "amazing"]):
-        hooks = ["This is breathtaking!", "Watch this incredible view!", "Amazing transformation!"]
-    elif any(word in prompt.lower() for word in ["action", "fast", "speed", "racing"]):
-        hooks = ["Watch this incredible move!", "This is insane!", "Speed like never before!"]
-    else:
-        hooks = ["This is amazing!", "Watch this!", "Incredible AI creation!"]
+@lru_cache(maxsize=64)
+def select_hooks(prompt):
+    """Pick the hook messages matching the prompt's content, once per prompt"""
+    prompt_lower = prompt.lower()
+    for keywords, hooks in HOOK_MESSAGES:
+        if keywords.search(prompt_lower):
+            return hooks
+    return DEFAULT_HOOKS
+
+def add_hook_overlay(frame, frame_idx, total_frames, prompt, hook_text=None):
+    """
+    Add engaging text overlays for viral content. Pass the same hook_text for
+    every frame of a video; without it a hook is picked per call.
+    """
     
     # Show hook text in first 3 seconds
     if frame_idx < total_frames * 0.3:
-        hook_text = random.choice(hooks)
-        
-        # Try to load a font, fallback to default
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 40)
-        except:
-            font = ImageFont.load_default()
+        if hook_text is None:
+            hook_text = random.choice(select_hooks(prompt))
         
         # Text positioning with animation
         text_y = 50 + int(10 * math.sin(frame_idx * 0.2))
         
-        # Add text shadow
-        draw.text((52, text_y + 2), hook_text, font=font, fill=(0, 0, 0, 128))
-        # Add main text
-        draw.text((50, text_y), hook_text, font=font, fill=(255, 255, 255, 255))
+        draw_cached_text(frame, (50, text_y), hook_text, 40)
     
     # Add call-to-action in last 2 seconds
     elif frame_idx > total_frames * 0.8:
         cta_text = "Follow for more AI magic! ✨"
         
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 30)
-        except:
-            font = ImageFont.load_default()
-        
-        text_y = frame_pil.height - 100
+        text_y = frame.shape[0] - 100
         
-        # Add text shadow
-        draw.text((52, text_y + 2), cta_text, font=font, fill=(0, 0, 0, 128))
-        # Add main text
-        draw.text((50, text_y), cta_text, font=font, fill=(255, 255, 255, 255))
+        draw_cached_text(frame, (50, text_y), cta_text, 30)
     
-    # Convert back to OpenCV format
-    frame_final = cv2.cvtColor(np.array(frame_pil), cv2.COLOR_RGB2BGR)
+    return frame
+
+@lru_cache(maxsize=8)
+def load_font(font_size):
+    """Load the overlay font once per size, falling back to PIL's default"""
+    # Try to load a font, fallback to default
+    try:
+        return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
+    except:
+        return ImageFont.load_default()
+
+@lru_cache(maxsize=32)
+def render_text_mask(text, font_size):
+    """
+    Rasterize text once into an antialiased alpha mask, returned with the
+    offset of its bounding box from the drawing origin
+    """
+    font = load_font(font_size)
+    left, top, right, bottom = font.getbbox(text)
+    mask = Image.new('L', (max(right - left, 1), max(bottom - top, 1)), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+    
+    # Coverage kept as 0-255 integers for fixed-point blending
+    alpha = np.asarray(mask, dtype=np.uint16)[:, :, None]
+    alpha.flags.writeable = False
+    return alpha, (left, top)
+
+@lru_cache(maxsize=32)
+def render_text_sprite(text, font_size):
+    """
+    Precompose white text and its black shadow into a single sprite: a 0-255
+    coverage mask plus the matching premultiplied ink, so a frame needs one
+    blend per overlay
+    """
+    text_alpha, _ = render_text_mask(text, font_size)
     
-    return frame_final
\ No newline at end of file
+    # Half-opaque shadow 2px down and right; composite the text over it
+    height, width = text_alpha.shape[:2]
+    alpha = np.zeros((height + 2, width + 2, 1), dtype=np.uint16)
+    alpha[2:, 2:] = (text_alpha * TEXT_SHADOW_OPACITY + 127) // 255
+    text_layer = np.zeros_like(alpha)
+    text_layer[:height, :width] = text_alpha
+    alpha = text_layer + (alpha * (255 - text_layer) + 127) // 255
+    
+    ink = text_layer * 255
+    alpha.flags.writeable = False
+    ink.flags.writeable = False
+    return alpha, ink
+
+def blend_text_sprite(frame, x, y, alpha, ink):
+    """
+    Blend a sprite's premultiplied ink through its 0-255 mask into a uint8
+    frame, in place, using rounded integer arithmetic in uint16
+    """
+    height, width = frame.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + alpha.shape[1], width), min(y + alpha.shape[0], height)
+    if x0 >= x1 or y0 >= y1:
+        return
+    
+    region = frame[y0:y1, x0:x1]
+    sprite = np.s_[y0 - y:y1 - y, x0 - x:x1 - x]
+    blended = region * (255 - alpha[sprite]) + ink[sprite]
+    blended += 127
+    blended //= 255
+    region[:] = blended
+
+def draw_cached_text(frame, position, text, font_size):
+    """
+    Draw shadowed text onto a BGR frame, touching only the text region
+    instead of round-tripping the whole frame through PIL
+    """
+    _, (left, top) = render_text_mask(text, font_size)
+    alpha, ink = render_text_sprite(text, font_size)
+    blend_text_sprite(frame, position[0] + left, position[1] + top, alpha, ink)